@@ -10,5 +10,18 @@ def load_settings() -> Settings:
         google_sheet_id=os.getenv("GOOGLE_SHEET_ID", ""),
         google_credentials_file=os.getenv("GOOGLE_SERVICE_ACCOUNT_FILE", "./data/google-credentials.json"),
         apartment_name=os.getenv("APARTMENT_NAME", "My Apartment"),
-        currency=os.getenv("CURRENCY", "USD")
-    )
\ No newline at end of file
+        currency=os.getenv("CURRENCY", "USD"),
+        max_jobs_per_chat=int(os.getenv("MAX_JOBS_PER_CHAT", "1")),
+        max_jobs_global=int(os.getenv("MAX_JOBS_GLOBAL", "4")),
+        max_pending_per_chat=int(os.getenv("MAX_PENDING_PER_CHAT", "3")),
+        bill_cache_ttl=float(os.getenv("BILL_CACHE_TTL", "600")),
+        cache_warm_periods=int(os.getenv("CACHE_WARM_PERIODS", "3")),
+        inline_cache_time=int(os.getenv("INLINE_CACHE_TIME", "10")),
+        cache_backend=os.getenv("CACHE_BACKEND", "memory"),
+        pending_ttl=float(os.getenv("PENDING_TTL", "300")),
+        workers=int(os.getenv("WORKERS", "1")),
+        webhook_url=os.getenv("WEBHOOK_URL", ""),
+        webhook_listen=os.getenv("WEBHOOK_LISTEN", "0.0.0.0"),
+        webhook_port=int(os.getenv("WEBHOOK_PORT", "8443")),
+        webhook_secret=os.getenv("WEBHOOK_SECRET", ""),
+    )
@@ -6,4 +6,23 @@ class Settings:
     google_sheet_id: str
     google_credentials_file: str
     apartment_name: str
-    currency: str = "USD"
\ No newline at end of file
+    currency: str = "USD"
+
+    # Work queue limits (see utils/work_queue.py)
+    max_jobs_per_chat: int = 1
+    max_jobs_global: int = 4
+    max_pending_per_chat: int = 3
+
+    # Bill cache (see utils/bill_cache.py)
+    bill_cache_ttl: float = 600.0
+    cache_warm_periods: int = 3
+    inline_cache_time: int = 10
+
+    # Shared state / sharded webhook deployment (see workers.py)
+    cache_backend: str = "memory"
+    pending_ttl: float = 300.0
+    workers: int = 1
+    webhook_url: str = ""
+    webhook_listen: str = "0.0.0.0"
+    webhook_port: int = 8443
+    webhook_secret: str = ""
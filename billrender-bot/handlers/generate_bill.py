@@ -3,7 +3,8 @@ from __future__ import annotations
 import tempfile
 from telegram.ext import CommandHandler
 
-from ..utils.google_sheet_source import GoogleSheetBillSource
+from ..utils.bill_cache import BillCache, get_bill_cache
+from ..utils.work_queue import PhotoReply, get_work_queue
 
 from billrender import (
     render_bill_to_image,
@@ -16,12 +17,17 @@ from billrender import (
 )
 
 
-async def generate_bill(update, context):
-    settings = context.application.bot_data["settings"]
+CAPTION = "Your latest utility bill."
+
+
+def render_bill(cache: BillCache) -> PhotoReply:
+    # 1) Bill from cache (loaded from the sheet if missing/stale)
+    bill = cache.get_or_load()
 
-    # 1) Use our BillSource-style class
-    source = GoogleSheetBillSource(settings)
-    bill = source.load_bill()
+    # Already uploaded for this exact bill: resend by file_id
+    file_id = cache.bill_photo_file_id(bill)
+    if file_id is not None:
+        return PhotoReply(caption=CAPTION, file_id=file_id)
 
     # 2) Template + formatting
     template = get_template("default_template_01")
@@ -44,9 +50,20 @@ async def generate_bill(update, context):
         output_path=temp_file.name,
     )
 
-    # 4) Send result
-    with open(temp_file.name, "rb") as f:
-        await update.message.reply_photo(photo=f, caption="Your latest utility bill.")
+    return PhotoReply(
+        path=temp_file.name,
+        caption=CAPTION,
+        on_sent=lambda fid: cache.set_photo_file_id(bill, fid),
+    )
+
+
+async def generate_bill(update, context):
+    cache = get_bill_cache(context)
+
+    # Render in the work queue; the queue sends the result
+    await get_work_queue(context).submit(
+        update, context, "generate_bill", lambda: render_bill(cache)
+    )
 
 
 generate_bill_handler = CommandHandler("generate_bill", generate_bill)
\ No newline at end of file
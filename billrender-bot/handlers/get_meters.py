@@ -4,27 +4,22 @@ from telegram import Update
 from telegram.ext import CommandHandler, ContextTypes
 
 from billrender import MeteredUtility, make_date_formatter
-from ..utils.google_sheet_source import GoogleSheetBillSource
+from ..keyboards.period_picker import period_keyboard
+from ..utils.bill_cache import BillCache, get_bill_cache, period_key
+from ..utils.work_queue import TextReply, get_work_queue
 
 
-async def get_meters(update: Update, context: ContextTypes.DEFAULT_TYPE):
+def format_meters(bill) -> str:
     """
-    Entry point for /meters.
-
-    Loads the current bill and prints all metered utilities in one message.
+    List all metered utilities of `bill` in one message.
     """
-    settings = context.application.bot_data["settings"]
-    source = GoogleSheetBillSource(settings)
-    bill = source.load_bill()
-
     period_fmt = make_date_formatter("%d.%m.%Y")
     last_update_str = period_fmt(bill.period_end)
 
     metered_utils = [u for u in bill.utilities if isinstance(u, MeteredUtility)]
 
     if not metered_utils:
-        await update.message.reply_text("No metered utilities found for this period.")
-        return
+        return "No metered utilities found for this period."
 
     lines: list[str] = []
     for u in metered_utils:
@@ -38,7 +33,26 @@ async def get_meters(update: Update, context: ContextTypes.DEFAULT_TYPE):
         "🔢 Last recorded meter readings:\n" + "\n".join(lines)
     )
 
-    await update.message.reply_text(text)
+    return text
+
+
+def build_meters_text(cache: BillCache) -> TextReply:
+    bill = cache.get_or_load()
+
+    return TextReply(
+        format_meters(bill),
+        reply_markup=period_keyboard("meters", period_key(bill.period_end), cache.periods()),
+    )
+
+
+async def get_meters(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """
+    Entry point for /meters.
+    """
+    cache = get_bill_cache(context)
+    await get_work_queue(context).submit(
+        update, context, "meters", lambda: build_meters_text(cache)
+    )
 
 
 get_meters_handler = CommandHandler("meters", get_meters)
\ No newline at end of file
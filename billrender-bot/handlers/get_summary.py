@@ -10,21 +10,17 @@ from billrender import (
     make_period_formatter,
 )
 
-from ..utils.google_sheet_source import GoogleSheetBillSource
+from ..keyboards.period_picker import period_keyboard
+from ..utils.bill_cache import BillCache, get_bill_cache, period_key
+from ..utils.work_queue import TextReply, get_work_queue
 
 
-async def get_summary(update, context):
-    settings = context.application.bot_data["settings"]
-
-    source = GoogleSheetBillSource(settings)
-    bill = source.load_bill()
-
+def format_summary(bill, currency: str) -> str:
     money_fmt = make_money_formatter(decimals=0, rounding="round")
     period_fmt = make_period_formatter("%d.%m.%Y")
 
     period_str = period_fmt(bill.period_start, bill.period_end)
     apartment_name = bill.apartment.name
-    currency = getattr(settings, "currency", "USD")
 
     utilities_lines = []
     utilities_total = 0.0
@@ -79,7 +75,25 @@ async def get_summary(update, context):
         f"🏠💰 Total: {money_fmt(grand_total)} {currency}"
     )
 
-    await update.message.reply_text(text)
+    return text
+
+
+def build_summary_text(settings, cache: BillCache) -> TextReply:
+    bill = cache.get_or_load()
+    currency = getattr(settings, "currency", "USD")
+
+    return TextReply(
+        format_summary(bill, currency),
+        reply_markup=period_keyboard("summary", period_key(bill.period_end), cache.periods()),
+    )
+
+
+async def get_summary(update, context):
+    settings = context.application.bot_data["settings"]
+    cache = get_bill_cache(context)
+    await get_work_queue(context).submit(
+        update, context, "get_summary", lambda: build_summary_text(settings, cache)
+    )
 
 
 get_summary_handler = CommandHandler("get_summary", get_summary)
\ No newline at end of file
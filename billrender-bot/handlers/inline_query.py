@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+import re
+from typing import Optional
+
+from telegram import (
+    InlineQueryResultArticle,
+    InlineQueryResultCachedPhoto,
+    InputTextMessageContent,
+    Update,
+)
+from telegram.ext import ContextTypes, InlineQueryHandler
+
+from ..utils.bill_cache import BillCache, get_bill_cache
+from .generate_bill import CAPTION
+from .period_callback import format_view
+
+PAGE_SIZE = 10
+PERIOD_RE = re.compile(r"^\d{4}-\d{2}$")
+
+VIEW_TITLES = {
+    "summary": "ℹ️ Summary",
+    "meters": "📊 Meter readings",
+    "bill": "📄 Bill",
+}
+
+
+def _parse_query(text: str):
+    """
+    '@bot summary 2025-03' -> ('summary', '2025-03'); view defaults to
+    summary, period to None (all cached periods).
+    """
+    parts = text.split()
+    view = "summary"
+    period = None
+
+    for part in parts:
+        lowered = part.lower()
+        if lowered in VIEW_TITLES:
+            view = lowered
+        elif PERIOD_RE.match(part):
+            period = part
+
+    return view, period
+
+
+def _build_page(cache: BillCache, settings, view: str, period: Optional[str], offset: int):
+    """
+    Results for one inline page and the next offset. Reads the cache
+    once per period on the page; blocking, run it in a thread.
+    """
+    if period is not None:
+        periods = [period]
+    else:
+        periods = list(reversed(cache.periods()))
+
+    if "bill" == view:
+        # Only bills already uploaded once can be shared inline
+        file_ids = {p: cache.photo_file_id(p) for p in periods}
+        periods = [p for p in periods if file_ids[p] is not None]
+
+    page = periods[offset:offset + PAGE_SIZE]
+    next_offset = str(offset + PAGE_SIZE) if offset + PAGE_SIZE < len(periods) else ""
+
+    title = VIEW_TITLES[view]
+    results = []
+    for p in page:
+        if "bill" == view:
+            results.append(
+                InlineQueryResultCachedPhoto(
+                    id=f"{view}:{p}",
+                    photo_file_id=file_ids[p],
+                    title=f"{title} {p}",
+                    caption=CAPTION,
+                )
+            )
+            continue
+
+        bill = cache.peek(p)
+        if bill is None:
+            continue
+        results.append(
+            InlineQueryResultArticle(
+                id=f"{view}:{p}",
+                title=f"{title} {p}",
+                input_message_content=InputTextMessageContent(format_view(view, bill, settings)),
+            )
+        )
+
+    return results, next_offset
+
+
+async def inline_query(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """
+    Inline mode: '@bot [summary|meters|bill] [YYYY-MM]'.
+
+    Answered purely from the bill cache (newest period first, paginated
+    with the inline offset); never calls Google Sheets or renders.
+    """
+    query = update.inline_query
+    view, period = _parse_query(query.query)
+
+    settings = context.application.bot_data["settings"]
+
+    try:
+        offset = int(query.offset or 0)
+    except ValueError:
+        offset = 0
+
+    results, next_offset = await asyncio.to_thread(
+        _build_page, get_bill_cache(context), settings, view, period, offset
+    )
+
+    await query.answer(
+        results,
+        cache_time=settings.inline_cache_time,
+        is_personal=True,
+        next_offset=next_offset,
+    )
+
+
+inline_query_handler = InlineQueryHandler(inline_query)
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Optional, Tuple
+
+from telegram import Update
+from telegram.error import BadRequest
+from telegram.ext import CallbackQueryHandler, ContextTypes
+
+from ..keyboards.period_picker import PERIOD_CALLBACK_PATTERN, period_keyboard
+from ..utils.bill_cache import BillCache, get_bill_cache
+from .get_meters import format_meters
+from .get_summary import format_summary
+
+
+def format_view(view: str, bill, settings) -> str:
+    if "meters" == view:
+        return format_meters(bill)
+    return format_summary(bill, getattr(settings, "currency", "USD"))
+
+
+def _build_view(cache: BillCache, settings, view: str, period: str) -> Optional[Tuple[str, object]]:
+    """
+    Text and keyboard for `period`, or None if it isn't cached. Blocking.
+    """
+    bill = cache.peek(period)
+    if bill is None:
+        return None
+    return format_view(view, bill, settings), period_keyboard(view, period, cache.periods())
+
+
+async def switch_period(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """
+    ◀ / ▶ buttons under summary/meters messages.
+
+    Served from the bill cache only; never calls Google Sheets.
+    """
+    query = update.callback_query
+    view, period = context.match.groups()
+
+    settings = context.application.bot_data["settings"]
+    built = await asyncio.to_thread(_build_view, get_bill_cache(context), settings, view, period)
+    if built is None:
+        await query.answer("This period is not loaded yet.")
+        return
+
+    await query.answer()
+
+    text, reply_markup = built
+    try:
+        await query.edit_message_text(text, reply_markup=reply_markup)
+    except BadRequest as exc:
+        # Same button tapped twice in a row
+        if "message is not modified" not in str(exc).lower():
+            raise
+
+
+period_callback_handler = CallbackQueryHandler(switch_period, pattern=PERIOD_CALLBACK_PATTERN)
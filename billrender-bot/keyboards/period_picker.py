@@ -0,0 +1,31 @@
+from typing import List, Optional
+
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+
+# callback_data is "<view>:<period>", e.g. "summary:2025-03"
+PERIOD_VIEWS = ("summary", "meters")
+PERIOD_CALLBACK_PATTERN = r"^(" + "|".join(PERIOD_VIEWS) + r"):(\d{4}-\d{2})$"
+
+
+def period_keyboard(view: str, period: str, periods: List[str]) -> Optional[InlineKeyboardMarkup]:
+    """
+    ◀ / ▶ buttons to step through the cached periods around `period`.
+
+    Returns None when there is nowhere to go.
+    """
+    if period not in periods:
+        return None
+
+    idx = periods.index(period)
+    buttons = []
+    if idx > 0:
+        prev = periods[idx - 1]
+        buttons.append(InlineKeyboardButton(f"◀ {prev}", callback_data=f"{view}:{prev}"))
+    if idx < len(periods) - 1:
+        nxt = periods[idx + 1]
+        buttons.append(InlineKeyboardButton(f"{nxt} ▶", callback_data=f"{view}:{nxt}"))
+
+    if not buttons:
+        return None
+
+    return InlineKeyboardMarkup([buttons])
@@ -1,24 +1,66 @@
-from telegram.ext import ApplicationBuilder
+import asyncio
+
+from telegram.ext import Application, ApplicationBuilder
 
 from .config.loader import load_settings
+from .config.settings import Settings
+from .storage.loader import make_backend
+from .utils.bill_cache import BillCache
+from .utils.work_queue import WorkQueue
 from .handlers.start import start_handler, menu_button_handler
 from .handlers.generate_bill import generate_bill_handler
 from .handlers.get_summary import get_summary_handler
 from .handlers.get_meters import get_meters_handler
 from .handlers.send_meter import send_meter_handler
+from .handlers.period_callback import period_callback_handler
+from .handlers.inline_query import inline_query_handler
 
 
-def main() -> None:
-    settings = load_settings()
+async def warm_cache(app: Application) -> None:
+    settings = app.bot_data["settings"]
+    try:
+        await asyncio.to_thread(app.bot_data["bill_cache"].warm, settings.cache_warm_periods)
+    except Exception as exc:
+        print(f"Bill cache warm-up failed: {exc}")
 
-    app = (
-        ApplicationBuilder()
-        .token(settings.telegram_bot_token)
-        .build()
-    )
+
+async def post_init(app: Application) -> None:
+    # A single polling process owns every chat: drop pending markers a
+    # previous run may have left in a persistent backend
+    await asyncio.to_thread(app.bot_data["work_queue"].clear_pending)
+
+    # Precompute recent periods in the background so inline queries and
+    # period buttons have something to serve right after startup
+    app.create_task(warm_cache(app))
+
+
+def build_application(settings: Settings, polling: bool = True) -> Application:
+    """
+    Application with all handlers and shared objects in bot_data.
+
+    polling=False builds it without an Updater, for sharded workers that
+    are fed updates by the webhook front (see workers.py).
+    """
+    builder = ApplicationBuilder().token(settings.telegram_bot_token)
+    if polling:
+        builder = builder.post_init(post_init)
+    else:
+        builder = builder.updater(None)
+    app = builder.build()
+
+    # One backend per process; shared between processes for sqlite/redis
+    backend = make_backend(settings.cache_backend)
 
     # Store settings so handlers can access them
     app.bot_data["settings"] = settings
+    app.bot_data["work_queue"] = WorkQueue(
+        max_jobs_per_chat=settings.max_jobs_per_chat,
+        max_jobs_global=settings.max_jobs_global,
+        max_pending_per_chat=settings.max_pending_per_chat,
+        backend=backend,
+        pending_ttl=settings.pending_ttl,
+    )
+    app.bot_data["bill_cache"] = BillCache(settings, ttl=settings.bill_cache_ttl, backend=backend)
 
     # Register handlers
     app.add_handler(start_handler)
@@ -27,6 +69,21 @@ def main() -> None:
     app.add_handler(get_summary_handler)
     app.add_handler(get_meters_handler)
     app.add_handler(send_meter_handler)
+    app.add_handler(period_callback_handler)
+    app.add_handler(inline_query_handler)
+
+    return app
+
+
+def main() -> None:
+    settings = load_settings()
+
+    if settings.webhook_url:
+        from .workers import run_sharded
+        run_sharded(settings)
+        return
+
+    app = build_application(settings)
 
     print("Bot is running...")
 
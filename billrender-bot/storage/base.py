@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from typing import List, Optional, Set
+
+
+class CacheBackend:
+    """
+    Key/value store shared by bill caches and work queues.
+
+    Values are bytes or sets of strings; `ttl` is in seconds (None = no
+    expiry). Calls are blocking and may come from worker threads, so
+    implementations must be thread-safe; callers on the event loop run
+    them via asyncio.to_thread(). A backend shared by several worker
+    processes (SQLite, Redis) is what lets them see each other's caches
+    and pending jobs.
+
+    Sets are explicit indexes (cached periods, a chat's pending jobs), so
+    hot paths never have to scan the keyspace with keys().
+    """
+
+    #: Whether other processes see the same data
+    shared: bool = False
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        """
+        Set `key` only if it doesn't exist yet. Returns True if it was set.
+        """
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def expire(self, key: str, ttl: float) -> None:
+        """
+        Reset the expiry of an existing key (value or set).
+        """
+        raise NotImplementedError
+
+    def keys(self, prefix: str) -> List[str]:
+        """
+        All keys starting with `prefix`. Scans the keyspace: maintenance
+        only (e.g. startup cleanup), never per update.
+        """
+        raise NotImplementedError
+
+    # --- sets --------------------------------------------------------------
+
+    def sadd(self, key: str, member: str) -> bool:
+        """
+        Add `member` to the set at `key`. Returns True if it wasn't there.
+        """
+        raise NotImplementedError
+
+    def srem(self, key: str, member: str) -> None:
+        raise NotImplementedError
+
+    def smembers(self, key: str) -> Set[str]:
+        raise NotImplementedError
+
+    def scard(self, key: str) -> int:
+        raise NotImplementedError
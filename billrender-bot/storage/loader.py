@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from .base import CacheBackend
+from .memory import MemoryBackend
+
+
+SHARED_SCHEMES = ("sqlite:///", "redis://", "rediss://", "unix://")
+
+
+def is_shared(url: str) -> bool:
+    """
+    Whether CACHE_BACKEND names a backend other processes can see,
+    decided from the URL alone (nothing is opened).
+    """
+    return (url or "memory").strip().startswith(SHARED_SCHEMES)
+
+
+def make_backend(url: str) -> CacheBackend:
+    """
+    Build a backend from CACHE_BACKEND:
+
+      memory                  process-local (default)
+      sqlite:///path/to/file  shared by workers on this host
+      redis://host:6379/0     shared by workers anywhere
+    """
+    url = (url or "memory").strip()
+
+    if "memory" == url:
+        return MemoryBackend()
+
+    if url.startswith("sqlite:///"):
+        from .sqlite import SQLiteBackend
+        return SQLiteBackend(url[len("sqlite:///"):])
+
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        from .redis import RedisBackend
+        return RedisBackend(url)
+
+    raise RuntimeError(f"Unsupported CACHE_BACKEND: {url!r}")
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+from .base import CacheBackend
+
+
+class MemoryBackend(CacheBackend):
+    """
+    Process-local backend; the default for a single polling bot.
+    """
+
+    shared = False
+
+    def __init__(self) -> None:
+        self._data: Dict[str, Tuple[Union[bytes, Set[str]], Optional[float]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _expires_at(ttl: Optional[float]) -> Optional[float]:
+        return time.monotonic() + ttl if ttl is not None else None
+
+    def _value(self, key: str):
+        """
+        Live value at `key` (dropping it if expired); caller holds the lock.
+        """
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    def _set_value(self, key: str) -> Set[str]:
+        value = self._value(key)
+        if not isinstance(value, set):
+            value = set()
+            self._data[key] = (value, None)
+        return value
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            value = self._value(key)
+            return value if isinstance(value, bytes) else None
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        with self._lock:
+            self._data[key] = (value, self._expires_at(ttl))
+
+    def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        with self._lock:
+            if self._value(key) is not None:
+                return False
+            self._data[key] = (value, self._expires_at(ttl))
+            return True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def expire(self, key: str, ttl: float) -> None:
+        with self._lock:
+            value = self._value(key)
+            if value is not None:
+                self._data[key] = (value, self._expires_at(ttl))
+
+    def keys(self, prefix: str) -> List[str]:
+        with self._lock:
+            return [k for k in list(self._data) if k.startswith(prefix) and self._value(k) is not None]
+
+    def sadd(self, key: str, member: str) -> bool:
+        with self._lock:
+            members = self._set_value(key)
+            if member in members:
+                return False
+            members.add(member)
+            return True
+
+    def srem(self, key: str, member: str) -> None:
+        with self._lock:
+            value = self._value(key)
+            if isinstance(value, set):
+                value.discard(member)
+                if not value:
+                    del self._data[key]
+
+    def smembers(self, key: str) -> Set[str]:
+        with self._lock:
+            value = self._value(key)
+            return set(value) if isinstance(value, set) else set()
+
+    def scard(self, key: str) -> int:
+        with self._lock:
+            value = self._value(key)
+            return len(value) if isinstance(value, set) else 0
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from typing import List, Optional, Set
+
+from .base import CacheBackend
+
+
+class RedisBackend(CacheBackend):
+    """
+    Backend on a Redis (or Redis-protocol-compatible) server, shared by
+    workers on any number of hosts. Needs the optional `redis` package.
+    """
+
+    shared = True
+
+    def __init__(self, url: str) -> None:
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError(
+                "CACHE_BACKEND is a redis:// URL but the 'redis' package is not installed."
+            ) from exc
+
+        self._client = redis.Redis.from_url(url)
+
+    @staticmethod
+    def _px(ttl: Optional[float]) -> Optional[int]:
+        return max(1, int(ttl * 1000)) if ttl is not None else None
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(key)
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        self._client.set(key, value, px=self._px(ttl))
+
+    def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        return bool(self._client.set(key, value, px=self._px(ttl), nx=True))
+
+    def delete(self, key: str) -> None:
+        self._client.delete(key)
+
+    def expire(self, key: str, ttl: float) -> None:
+        self._client.pexpire(key, self._px(ttl))
+
+    def keys(self, prefix: str) -> List[str]:
+        # Glob metacharacters in the prefix must match literally
+        pattern = "".join("\\" + c if c in "*?[]\\" else c for c in prefix) + "*"
+        return [k.decode() for k in self._client.scan_iter(match=pattern)]
+
+    def sadd(self, key: str, member: str) -> bool:
+        return 1 == self._client.sadd(key, member)
+
+    def srem(self, key: str, member: str) -> None:
+        self._client.srem(key, member)
+
+    def smembers(self, key: str) -> Set[str]:
+        return {m.decode() for m in self._client.smembers(key)}
+
+    def scard(self, key: str) -> int:
+        return self._client.scard(key)
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from typing import List, Optional, Set
+
+from .base import CacheBackend
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    Backend in a single SQLite file, shared by all worker processes on
+    one host. Each process opens its own connection (create the backend
+    after forking).
+
+    Values live in `kv`; sets in `sets`, one row per member, with the
+    set's expiry repeated on every row.
+    """
+
+    shared = True
+
+    def __init__(self, path: str) -> None:
+        self._conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS kv ("
+                " key TEXT PRIMARY KEY,"
+                " value BLOB NOT NULL,"
+                " expires_at REAL"
+                ")"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sets ("
+                " key TEXT NOT NULL,"
+                " member TEXT NOT NULL,"
+                " expires_at REAL,"
+                " PRIMARY KEY (key, member)"
+                ")"
+            )
+
+    @staticmethod
+    def _expires_at(ttl: Optional[float]) -> Optional[float]:
+        return time.time() + ttl if ttl is not None else None
+
+    def _purge(self, table: str, key: str, now: float) -> None:
+        # Expired rows don't count as existing; caller holds the lock
+        self._conn.execute(
+            f"DELETE FROM {table} WHERE key = ? AND expires_at IS NOT NULL AND expires_at <= ?",
+            (key, now),
+        )
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM kv WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, time.time()),
+            ).fetchone()
+        return bytes(row[0]) if row else None
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, self._expires_at(ttl)),
+            )
+
+    def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        with self._lock:
+            self._purge("kv", key, time.time())
+            cur = self._conn.execute(
+                "INSERT OR IGNORE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, self._expires_at(ttl)),
+            )
+        return cur.rowcount == 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM kv WHERE key = ?", (key,))
+            self._conn.execute("DELETE FROM sets WHERE key = ?", (key,))
+
+    def expire(self, key: str, ttl: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._purge("kv", key, now)
+            self._purge("sets", key, now)
+            self._conn.execute("UPDATE kv SET expires_at = ? WHERE key = ?", (now + ttl, key))
+            self._conn.execute("UPDATE sets SET expires_at = ? WHERE key = ?", (now + ttl, key))
+
+    def keys(self, prefix: str) -> List[str]:
+        escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key FROM kv WHERE key LIKE ? ESCAPE '\\'"
+                " AND (expires_at IS NULL OR expires_at > ?)"
+                " UNION "
+                "SELECT key FROM sets WHERE key LIKE ? ESCAPE '\\'"
+                " AND (expires_at IS NULL OR expires_at > ?)",
+                (escaped + "%", time.time(), escaped + "%", time.time()),
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def sadd(self, key: str, member: str) -> bool:
+        with self._lock:
+            self._purge("sets", key, time.time())
+            # New members inherit the set's current expiry
+            row = self._conn.execute(
+                "SELECT expires_at FROM sets WHERE key = ? LIMIT 1", (key,)
+            ).fetchone()
+            cur = self._conn.execute(
+                "INSERT OR IGNORE INTO sets (key, member, expires_at) VALUES (?, ?, ?)",
+                (key, member, row[0] if row else None),
+            )
+        return cur.rowcount == 1
+
+    def srem(self, key: str, member: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM sets WHERE key = ? AND member = ?", (key, member))
+
+    def smembers(self, key: str) -> Set[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT member FROM sets WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, time.time()),
+            ).fetchall()
+        return {r[0] for r in rows}
+
+    def scard(self, key: str) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM sets WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, time.time()),
+            ).fetchone()
+        return row[0]
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import json
+import time
+from datetime import date
+from typing import List, Optional
+
+from billrender import Bill
+
+from ..config.settings import Settings
+from ..storage.base import CacheBackend
+from ..storage.memory import MemoryBackend
+from .bill_codec import bill_fingerprint, bill_from_dict, bill_to_dict
+from .google_sheet_source import GoogleSheetBillSource
+
+
+def period_key(d: date) -> str:
+    """
+    Cache key of the period ending on `d`, e.g. '2025-03'.
+    """
+    return f"{d.year:04d}-{d.month:02d}"
+
+
+def parse_period_key(key: str) -> date:
+    """
+    Inverse of period_key(): '2025-03' -> the period end date (the 12th).
+    """
+    year, month = key.split("-")
+    return date(int(year), int(month), 12)
+
+
+def _previous_period_key(key: str) -> str:
+    d = parse_period_key(key)
+    if 1 == d.month:
+        return period_key(date(d.year - 1, 12, 12))
+    return period_key(date(d.year, d.month - 1, 12))
+
+
+ENTRY_PREFIX = "bill:period:"
+PHOTO_PREFIX = "bill:photo:"
+PERIODS_KEY = "bill:periods"
+LATEST_KEY = "bill:latest"
+
+
+class BillCache:
+    """
+    Cache of loaded bills, keyed by period ('YYYY-MM' of the period end).
+
+    Commands go through get_or_load(), which hits Google Sheets only when
+    the entry is missing or older than `ttl` seconds. Inline queries and
+    callback buttons use peek(), which never touches Sheets and serves
+    whatever is cached, however old.
+
+    Entries live in a CacheBackend as JSON ({"bill", "loaded_at",
+    "fingerprint"}), so worker processes sharing a backend share the
+    cache. Uploaded photo file_ids are stored next to them under the bill
+    fingerprint, so they never need a read-modify-write of the entry and
+    can't be attached to different data.
+
+    All methods block on the backend: call them from worker threads.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        ttl: float = 600.0,
+        backend: Optional[CacheBackend] = None,
+    ) -> None:
+        self._settings = settings
+        self._ttl = ttl
+        self._backend = backend if backend is not None else MemoryBackend()
+
+    def _get_entry(self, period: Optional[str]) -> Optional[dict]:
+        key = period or self.latest_period()
+        if not key:
+            return None
+        raw = self._backend.get(ENTRY_PREFIX + key)
+        return json.loads(raw) if raw is not None else None
+
+    # --- cache-only access -------------------------------------------------
+
+    def latest_period(self) -> Optional[str]:
+        raw = self._backend.get(LATEST_KEY)
+        return raw.decode() if raw is not None else None
+
+    def periods(self) -> List[str]:
+        """
+        All cached periods, oldest first.
+        """
+        return sorted(self._backend.smembers(PERIODS_KEY))
+
+    def peek(self, period: Optional[str] = None) -> Optional[Bill]:
+        entry = self._get_entry(period)
+        return bill_from_dict(entry["bill"]) if entry else None
+
+    def photo_file_id(self, period: str) -> Optional[str]:
+        """
+        file_id of the uploaded photo of the bill currently cached for
+        `period`, if that exact bill was ever sent.
+        """
+        entry = self._get_entry(period)
+        if entry is None:
+            return None
+        raw = self._backend.get(f"{PHOTO_PREFIX}{period}:{entry['fingerprint']}")
+        return raw.decode() if raw is not None else None
+
+    def bill_photo_file_id(self, bill: Bill) -> Optional[str]:
+        """
+        file_id of the uploaded photo of exactly `bill`, if any.
+        """
+        period = period_key(bill.period_end)
+        raw = self._backend.get(f"{PHOTO_PREFIX}{period}:{bill_fingerprint(bill)}")
+        return raw.decode() if raw is not None else None
+
+    def set_photo_file_id(self, bill: Bill, file_id: str) -> None:
+        """
+        Remember the uploaded photo of `bill`. Keyed by its fingerprint, so
+        if the cache moved on to different data while it was rendering,
+        the photo simply never matches.
+        """
+        period = period_key(bill.period_end)
+        key = f"{PHOTO_PREFIX}{period}:{bill_fingerprint(bill)}"
+        self._backend.set(key, file_id.encode())
+
+    # --- loading -----------------------------------------------------------
+
+    def get_or_load(self, period: Optional[str] = None) -> Bill:
+        """
+        Return the bill for `period` (None = current period), loading it
+        from Google Sheets if not cached or stale. Blocking.
+        """
+        entry = self._get_entry(period)
+        if entry is not None and time.time() - entry["loaded_at"] < self._ttl:
+            return bill_from_dict(entry["bill"])
+
+        return self.load(period)
+
+    def load(self, period: Optional[str] = None) -> Bill:
+        target_date = parse_period_key(period) if period else None
+        bill = GoogleSheetBillSource(self._settings, target_date).load_bill()
+        self.put(bill, latest=period is None)
+        return bill
+
+    def put(self, bill: Bill, latest: bool = False) -> str:
+        key = period_key(bill.period_end)
+        entry = {
+            "bill": bill_to_dict(bill),
+            "loaded_at": time.time(),
+            "fingerprint": bill_fingerprint(bill),
+        }
+        self._backend.set(ENTRY_PREFIX + key, json.dumps(entry, ensure_ascii=False).encode())
+        self._backend.sadd(PERIODS_KEY, key)
+        if latest:
+            self._backend.set(LATEST_KEY, key.encode())
+        return key
+
+    def warm(self, months: int) -> None:
+        """
+        Precompute the current period and up to `months - 1` previous ones,
+        so inline queries and period buttons can be answered from memory.
+        Stops quietly at the first period the sheet can't provide.
+        """
+        if months <= 0:
+            return
+
+        key = period_key(self.load().period_end)
+        for _ in range(months - 1):
+            key = _previous_period_key(key)
+            try:
+                self.load(key)
+            except Exception:
+                break
+
+
+def get_bill_cache(context) -> BillCache:
+    return context.application.bot_data["bill_cache"]
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import date
+from typing import Any, Dict
+
+from billrender import (
+    Bill,
+    Apartment,
+    MeteredUtility,
+    FixedUtility,
+    PrecalculatedUtility,
+)
+
+
+def _utility_to_dict(u) -> Dict[str, Any]:
+    if isinstance(u, MeteredUtility):
+        return {
+            "type": "metered",
+            "name": u.name,
+            "unit_label": u.unit_label,
+            "unit_price": u.unit_price,
+            "previous_value": u.previous_value,
+            "current_value": u.current_value,
+            "fixed_price": u.fixed_price,
+            "icon": u.icon,
+        }
+    if isinstance(u, PrecalculatedUtility):
+        return {
+            "type": "precalculated",
+            "name": u.name,
+            "unit_label": u.unit_label,
+            "unit_price": u.unit_price,
+            "amount": u.amount,
+            "fixed_price": u.fixed_price,
+            "icon": u.icon,
+        }
+    if isinstance(u, FixedUtility):
+        return {
+            "type": "fixed",
+            "name": u.name,
+            "fixed_price": u.fixed_price,
+            "icon": u.icon,
+        }
+    raise TypeError(f"Cannot serialize utility of type {type(u).__name__}")
+
+
+def _utility_from_dict(data: Dict[str, Any]):
+    data = dict(data)
+    kind = data.pop("type")
+    if "metered" == kind:
+        return MeteredUtility(**data)
+    if "precalculated" == kind:
+        return PrecalculatedUtility(**data)
+    if "fixed" == kind:
+        return FixedUtility(**data)
+    raise ValueError(f"Unknown utility type {kind!r}")
+
+
+def bill_to_dict(bill: Bill) -> Dict[str, Any]:
+    """
+    Plain-JSON form of a Bill, covering the fields build_bill() sets.
+    """
+    return {
+        "apartment": {"name": bill.apartment.name},
+        "period_start": bill.period_start.isoformat(),
+        "period_end": bill.period_end.isoformat(),
+        "rent": bill.rent,
+        "utilities": [_utility_to_dict(u) for u in bill.utilities],
+    }
+
+
+def bill_from_dict(data: Dict[str, Any]) -> Bill:
+    return Bill(
+        apartment=Apartment(name=data["apartment"]["name"]),
+        period_start=date.fromisoformat(data["period_start"]),
+        period_end=date.fromisoformat(data["period_end"]),
+        rent=float(data["rent"]),
+        utilities=[_utility_from_dict(u) for u in data["utilities"]],
+    )
+
+
+def bill_fingerprint(bill: Bill) -> str:
+    """
+    Short stable hash of the bill's data; equal bills, equal fingerprints.
+    """
+    raw = json.dumps(bill_to_dict(bill), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import zlib
+from typing import Any, Dict
+
+# Update fields carrying a message with a chat
+_MESSAGE_FIELDS = (
+    "message",
+    "edited_message",
+    "channel_post",
+    "edited_channel_post",
+)
+
+# Update fields with only a sender
+_USER_FIELDS = (
+    "inline_query",
+    "chosen_inline_result",
+    "shipping_query",
+    "pre_checkout_query",
+)
+
+
+def shard_key(data: Dict[str, Any]) -> int:
+    """
+    Chat (or, failing that, user) id of a raw Telegram update.
+
+    In private chats the chat id equals the user id, so a user's inline
+    queries land on the same worker as their chat.
+    """
+    for field in _MESSAGE_FIELDS:
+        message = data.get(field)
+        if message:
+            return message["chat"]["id"]
+
+    callback = data.get("callback_query")
+    if callback:
+        message = callback.get("message")
+        if message:
+            return message["chat"]["id"]
+        return callback["from"]["id"]
+
+    for field in _USER_FIELDS:
+        payload = data.get(field)
+        if payload:
+            return payload["from"]["id"]
+
+    return data.get("update_id", 0)
+
+
+def shard_for_chat(chat_id: int, workers: int) -> int:
+    """
+    Worker index owning `chat_id`. Stable across restarts (crc32, not
+    hash()), so a chat always goes to the same worker for a given worker
+    count.
+    """
+    if workers <= 1:
+        return 0
+    return zlib.crc32(str(chat_id).encode()) % workers
+
+
+def shard_for(data: Dict[str, Any], workers: int) -> int:
+    """
+    Worker index for a raw update.
+    """
+    return shard_for_chat(shard_key(data), workers)
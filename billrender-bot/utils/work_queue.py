@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Set, Union
+
+from telegram import InlineKeyboardMarkup, Message, Update
+from telegram.error import TelegramError
+from telegram.ext import ContextTypes
+
+from ..storage.base import CacheBackend
+from ..storage.memory import MemoryBackend
+
+WORKING_TEXT = "⏳ Working…"
+BUSY_TEXT = "⏳ Still working on your previous requests, please wait."
+DUPLICATE_TEXT = "⏳ Already working on it, please wait."
+FAILED_TEXT = "⚠️ Something went wrong, please try again later."
+
+
+@dataclass
+class TextReply:
+    text: str
+    reply_markup: Optional[InlineKeyboardMarkup] = None
+
+
+@dataclass
+class PhotoReply:
+    """
+    Either a freshly rendered file (`path`, removed once sent) or an
+    already uploaded photo (`file_id`). `on_sent` receives the file_id
+    Telegram assigned.
+    """
+    path: Optional[str] = None
+    caption: str = ""
+    file_id: Optional[str] = None
+    on_sent: Optional[Callable[[str], None]] = None
+
+
+JobResult = Union[TextReply, PhotoReply]
+
+# Set of a chat's pending job keys: "pending:<chat_id>"
+PENDING_PREFIX = "pending:"
+
+
+class WorkQueue:
+    """
+    Scheduler between the handlers and the actual (blocking) work.
+
+    - Caps in-flight jobs per chat and globally.
+    - Merges duplicate pending requests: while a job with the same key is
+      queued or running for a chat, further taps only get a short reply.
+    - Rejects new jobs once a chat has too many pending ones.
+    - Replies with a "working…" placeholder right away and later edits it
+      with the result (photos replace the placeholder).
+
+    Jobs are plain sync callables returning a JobResult; they run in a
+    worker thread so Google/render calls don't block the event loop.
+
+    Pending jobs are also recorded in a per-chat set in `backend`, so with
+    a shared backend duplicates are merged across worker processes. The
+    set's TTL is refreshed while a job runs and only matters if a worker
+    dies; a restarting worker drops its chats' leftovers with
+    clear_pending(). The in-flight limits are per process: "global" means
+    per worker.
+    """
+
+    def __init__(
+        self,
+        max_jobs_per_chat: int = 1,
+        max_jobs_global: int = 4,
+        max_pending_per_chat: int = 3,
+        backend: Optional[CacheBackend] = None,
+        pending_ttl: float = 300.0,
+    ) -> None:
+        self._max_jobs_per_chat = max_jobs_per_chat
+        self._max_pending_per_chat = max_pending_per_chat
+        self._global = asyncio.Semaphore(max_jobs_global)
+        self._per_chat: Dict[int, asyncio.Semaphore] = {}
+        # Jobs of this process, per chat
+        self._pending: Dict[int, Set[str]] = {}
+        self._backend = backend if backend is not None else MemoryBackend()
+        self._pending_ttl = pending_ttl
+
+    @staticmethod
+    def _pending_key(chat_id: int) -> str:
+        return f"{PENDING_PREFIX}{chat_id}"
+
+    # --- backend side (blocking, run in threads) ---------------------------
+
+    def is_pending(self, chat_id: int, key: str) -> bool:
+        return key in self._backend.smembers(self._pending_key(chat_id))
+
+    def _reserve(self, chat_id: int, key: str) -> Optional[str]:
+        """
+        Record the job as pending. Returns the refusal text, or None.
+        """
+        pending_key = self._pending_key(chat_id)
+
+        if not self._backend.sadd(pending_key, key):
+            return DUPLICATE_TEXT
+
+        if self._backend.scard(pending_key) > self._max_pending_per_chat:
+            self._backend.srem(pending_key, key)
+            return BUSY_TEXT
+
+        self._backend.expire(pending_key, self._pending_ttl)
+        return None
+
+    def clear_pending(self, owns: Optional[Callable[[int], bool]] = None) -> None:
+        """
+        Drop pending markers left by a previous run, for the chats `owns`
+        accepts (all chats if None). Call once at startup.
+        """
+        for key in self._backend.keys(PENDING_PREFIX):
+            try:
+                chat_id = int(key[len(PENDING_PREFIX):])
+            except ValueError:
+                continue
+            if owns is None or owns(chat_id):
+                self._backend.delete(key)
+
+    # --- event loop side ---------------------------------------------------
+
+    async def submit(
+        self,
+        update: Update,
+        context: ContextTypes.DEFAULT_TYPE,
+        key: str,
+        job: Callable[[], JobResult],
+    ) -> bool:
+        """
+        Schedule `job` for the chat of `update`.
+
+        Returns immediately; False if the request was merged or rejected.
+        """
+        chat_id = update.effective_chat.id
+
+        if key in self._pending.get(chat_id, ()):
+            refusal = DUPLICATE_TEXT
+        else:
+            refusal = await asyncio.to_thread(self._reserve, chat_id, key)
+
+        if refusal is not None:
+            await update.effective_message.reply_text(refusal)
+            return False
+
+        self._pending.setdefault(chat_id, set()).add(key)
+        try:
+            placeholder = await update.effective_message.reply_text(WORKING_TEXT)
+        except Exception:
+            await self._release(chat_id, key)
+            raise
+
+        context.application.create_task(
+            self._run(chat_id, key, job, placeholder),
+            update=update,
+        )
+        return True
+
+    async def _run(self, chat_id: int, key: str, job, placeholder) -> None:
+        keep_alive = asyncio.ensure_future(self._keep_alive(chat_id))
+        try:
+            try:
+                async with self._chat_semaphore(chat_id), self._global:
+                    result = await asyncio.to_thread(job)
+
+                sent = await self._deliver(placeholder, result)
+            except Exception:
+                await self._fail(placeholder)
+                raise
+
+            # Delivered: whatever happens next must not report a failure
+            await self._after_delivery(placeholder, result, sent)
+        finally:
+            keep_alive.cancel()
+            await self._release(chat_id, key)
+
+    async def _keep_alive(self, chat_id: int) -> None:
+        # Keep the pending marker from expiring under a long job
+        while True:
+            await asyncio.sleep(self._pending_ttl / 3)
+            try:
+                await asyncio.to_thread(self._backend.expire, self._pending_key(chat_id), self._pending_ttl)
+            except Exception:
+                pass
+
+    async def _fail(self, placeholder) -> None:
+        # Best effort: don't leave the placeholder at "Working…"
+        try:
+            await placeholder.edit_text(FAILED_TEXT)
+        except Exception:
+            pass
+
+    async def _deliver(self, placeholder, result: JobResult) -> Optional[Message]:
+        if isinstance(result, TextReply):
+            await placeholder.edit_text(result.text, reply_markup=result.reply_markup)
+            return None
+
+        # A text message can't be edited into a photo: send it and drop
+        # the placeholder instead.
+        if result.file_id is not None:
+            sent = await placeholder.chat.send_photo(photo=result.file_id, caption=result.caption)
+        else:
+            try:
+                with open(result.path, "rb") as f:
+                    sent = await placeholder.chat.send_photo(photo=f, caption=result.caption)
+            finally:
+                os.unlink(result.path)
+        return sent
+
+    async def _after_delivery(self, placeholder, result: JobResult, sent: Optional[Message]) -> None:
+        if not isinstance(result, PhotoReply):
+            return
+
+        try:
+            await placeholder.delete()
+        except TelegramError:
+            # The bill is out; a leftover placeholder is only cosmetic
+            pass
+
+        if result.on_sent is not None and sent is not None and sent.photo:
+            await asyncio.to_thread(result.on_sent, sent.photo[-1].file_id)
+
+    def _chat_semaphore(self, chat_id: int) -> asyncio.Semaphore:
+        sem = self._per_chat.get(chat_id)
+        if sem is None:
+            sem = asyncio.Semaphore(self._max_jobs_per_chat)
+            self._per_chat[chat_id] = sem
+        return sem
+
+    async def _release(self, chat_id: int, key: str) -> None:
+        await asyncio.to_thread(self._backend.srem, self._pending_key(chat_id), key)
+
+        pending = self._pending.get(chat_id)
+        if pending is None:
+            return
+        pending.discard(key)
+        if not pending:
+            del self._pending[chat_id]
+            self._per_chat.pop(chat_id, None)
+
+
+def get_work_queue(context: ContextTypes.DEFAULT_TYPE) -> WorkQueue:
+    return context.application.bot_data["work_queue"]
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import multiprocessing
+import signal
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+from urllib.parse import urlparse
+
+from telegram import Bot, Update
+
+from .config.settings import Settings
+from .main import build_application, warm_cache
+from .storage.loader import is_shared
+from .utils.sharding import shard_for, shard_for_chat
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+# Update types the handlers consume; everything else stays at Telegram
+ALLOWED_UPDATES = ["message", "callback_query", "inline_query"]
+
+# How often the front checks that its workers are alive (seconds)
+SUPERVISE_INTERVAL = 1.0
+
+# Workers are spawned, not forked: the front runs server threads
+_mp = multiprocessing.get_context("spawn")
+
+
+def _check_settings(settings: Settings) -> None:
+    if settings.workers < 1:
+        raise RuntimeError("WORKERS must be at least 1.")
+
+    if settings.workers > 1 and not is_shared(settings.cache_backend):
+        raise RuntimeError(
+            f"CACHE_BACKEND={settings.cache_backend!r} is process-local; "
+            "use sqlite:///... or redis://... with several workers."
+        )
+
+
+async def _serve_worker(index: int, settings: Settings, updates) -> None:
+    app = build_application(settings, polling=False)
+
+    async with app:
+        # Pending markers of our chats are leftovers of a dead predecessor
+        await asyncio.to_thread(
+            app.bot_data["work_queue"].clear_pending,
+            lambda chat_id: shard_for_chat(chat_id, settings.workers) == index,
+        )
+
+        # The cache is shared, so one worker warming it is enough
+        if 0 == index:
+            app.create_task(warm_cache(app))
+
+        await app.start()
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                data = await loop.run_in_executor(None, updates.get)
+                if data is None:
+                    break
+                await app.update_queue.put(Update.de_json(data, app.bot))
+        finally:
+            await app.stop()
+
+
+def _worker_main(index: int, settings: Settings, updates) -> None:
+    # Shutdown is driven by the front through the queue sentinel
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+
+    print(f"Worker {index} is running...")
+    asyncio.run(_serve_worker(index, settings, updates))
+
+
+def _start_worker(index: int, settings: Settings, updates):
+    worker = _mp.Process(
+        target=_worker_main,
+        args=(index, settings, updates),
+        name=f"billrender-worker-{index}",
+        daemon=True,
+    )
+    worker.start()
+    return worker
+
+
+def _make_request_handler(settings: Settings, queues: List, workers: List):
+    path = urlparse(settings.webhook_url).path or "/"
+
+    class WebhookHandler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:
+            if self.path != path:
+                self.send_error(404)
+                return
+
+            if settings.webhook_secret and self.headers.get(SECRET_HEADER) != settings.webhook_secret:
+                self.send_error(403)
+                return
+
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                data = json.loads(self.rfile.read(length))
+            except ValueError:
+                self.send_error(400)
+                return
+
+            if not isinstance(data, dict):
+                self.send_error(400)
+                return
+
+            index = shard_for(data, len(queues))
+
+            # Don't buffer for a dead worker: let Telegram redeliver once
+            # the supervisor has restarted it
+            if not workers[index].is_alive():
+                self.send_error(503)
+                return
+
+            queues[index].put(data)
+
+            self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, format, *args) -> None:
+            # One line per update is too noisy
+            pass
+
+    return WebhookHandler
+
+
+async def _set_webhook(settings: Settings) -> None:
+    async with Bot(settings.telegram_bot_token) as bot:
+        await bot.set_webhook(
+            url=settings.webhook_url,
+            secret_token=settings.webhook_secret or None,
+            allowed_updates=ALLOWED_UPDATES,
+        )
+
+
+def run_sharded(settings: Settings) -> None:
+    """
+    Webhook deployment with `settings.workers` worker processes.
+
+    This process only receives webhook POSTs and forwards each update to
+    the worker owning its chat (see utils/sharding.py); the workers run the
+    handlers and share bill caches and pending-job state through
+    CACHE_BACKEND. Dead workers are restarted; updates for them are
+    answered with 503 meanwhile so Telegram retries. SIGINT/SIGTERM stop
+    the front and the workers cleanly.
+
+    The front speaks plain HTTP; put it behind a TLS-terminating proxy
+    that WEBHOOK_URL points to.
+    """
+    _check_settings(settings)
+
+    asyncio.run(_set_webhook(settings))
+
+    queues = [_mp.Queue() for _ in range(settings.workers)]
+    workers = [_start_worker(i, settings, q) for i, q in enumerate(queues)]
+
+    server = ThreadingHTTPServer(
+        (settings.webhook_listen, settings.webhook_port),
+        _make_request_handler(settings, queues, workers),
+    )
+    server_thread = threading.Thread(target=server.serve_forever, name="webhook-server", daemon=True)
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    signal.signal(signal.SIGINT, lambda signum, frame: stop.set())
+
+    server_thread.start()
+    print(f"Bot is running with {settings.workers} workers...")
+
+    try:
+        while not stop.wait(SUPERVISE_INTERVAL):
+            for i, worker in enumerate(workers):
+                if not worker.is_alive():
+                    print(f"Worker {i} exited with code {worker.exitcode}, restarting...")
+                    workers[i] = _start_worker(i, settings, queues[i])
+    finally:
+        server.shutdown()
+        server.server_close()
+        for q in queues:
+            q.put(None)
+        for worker in workers:
+            worker.join(timeout=10)
+            if worker.is_alive():
+                worker.terminate()
@@ -0,0 +1,13 @@
+import importlib.machinery
+import importlib.util
+import sys
+from pathlib import Path
+
+# The bot lives in "billrender-bot/" (not an importable name) and uses
+# relative imports; expose it as the "billrender_bot" package.
+PKG_DIR = Path(__file__).resolve().parent.parent / "billrender-bot"
+
+if "billrender_bot" not in sys.modules:
+    spec = importlib.machinery.ModuleSpec("billrender_bot", None, is_package=True)
+    spec.submodule_search_locations = [str(PKG_DIR)]
+    sys.modules["billrender_bot"] = importlib.util.module_from_spec(spec)
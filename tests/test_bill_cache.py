@@ -0,0 +1,86 @@
+from datetime import date
+
+import pytest
+
+billrender = pytest.importorskip("billrender")
+pytest.importorskip("gspread")
+
+from billrender_bot.config.settings import Settings
+from billrender_bot.storage.sqlite import SQLiteBackend
+from billrender_bot.utils.bill_cache import BillCache
+from billrender_bot.utils.bill_codec import bill_fingerprint, bill_from_dict, bill_to_dict
+
+
+def _settings():
+    return Settings(
+        telegram_bot_token="",
+        google_sheet_id="",
+        google_credentials_file="",
+        apartment_name="Flat",
+    )
+
+
+def _bill(month=3, gas_current=120):
+    return billrender.Bill(
+        apartment=billrender.Apartment(name="Flat"),
+        period_start=date(2025, month - 1, 12),
+        period_end=date(2025, month, 12),
+        rent=500.0,
+        utilities=[
+            billrender.MeteredUtility(
+                name="Gas",
+                unit_label="m³",
+                unit_price=1.5,
+                previous_value=100,
+                current_value=gas_current,
+                fixed_price=3.0,
+                icon="🔥",
+            ),
+            billrender.PrecalculatedUtility(
+                name="Heating",
+                unit_label="Gcal",
+                unit_price=80.0,
+                amount=0.5,
+                fixed_price=0.0,
+                icon="🌡",
+            ),
+            billrender.FixedUtility(name="Trash Utilisation", fixed_price=7.0, icon="🗑"),
+        ],
+    )
+
+
+def test_codec_round_trip():
+    bill = _bill()
+    assert bill_to_dict(bill) == bill_to_dict(bill_from_dict(bill_to_dict(bill)))
+    assert bill_fingerprint(bill) == bill_fingerprint(_bill())
+    assert bill_fingerprint(bill) != bill_fingerprint(_bill(gas_current=130))
+
+
+def test_instances_on_one_db_share_entries_and_photos(tmp_path):
+    path = str(tmp_path / "cache.db")
+    first = BillCache(_settings(), backend=SQLiteBackend(path))
+    second = BillCache(_settings(), backend=SQLiteBackend(path))
+
+    bill = _bill()
+    first.put(bill, latest=True)
+    first.put(_bill(month=2))
+
+    assert ["2025-02", "2025-03"] == second.periods()
+    assert "2025-03" == second.latest_period()
+    assert bill_to_dict(bill) == bill_to_dict(second.peek())
+
+    second.set_photo_file_id(bill, "file-1")
+    assert "file-1" == first.photo_file_id("2025-03")
+    assert "file-1" == first.bill_photo_file_id(bill)
+
+
+def test_photo_of_older_data_is_not_reused(tmp_path):
+    cache = BillCache(_settings(), backend=SQLiteBackend(str(tmp_path / "cache.db")))
+
+    rendered = _bill()
+    cache.put(rendered)
+    # The sheet changed while the old bill was being rendered
+    cache.put(_bill(gas_current=130))
+    cache.set_photo_file_id(rendered, "stale")
+
+    assert cache.photo_file_id("2025-03") is None
@@ -0,0 +1,42 @@
+from collections import Counter
+
+from billrender_bot.utils.sharding import shard_for, shard_for_chat, shard_key
+
+
+def _message(chat_id):
+    return {"update_id": 1, "message": {"chat": {"id": chat_id}, "from": {"id": chat_id}}}
+
+
+def test_stable_for_a_chat():
+    # Pinned value: must not change between runs/processes (no hash())
+    assert 0 == shard_for_chat(42, 4)
+    assert 0 == shard_for(_message(42), 4)
+
+
+def test_same_private_user_same_worker():
+    user_id = 123456789
+    updates = [
+        _message(user_id),
+        {"update_id": 2, "callback_query": {"from": {"id": user_id}, "message": {"chat": {"id": user_id}}}},
+        {"update_id": 3, "inline_query": {"from": {"id": user_id}, "query": ""}},
+    ]
+
+    assert 1 == len({shard_for(u, 8) for u in updates})
+
+
+def test_callback_without_message_uses_sender():
+    assert 7 == shard_key({"update_id": 1, "callback_query": {"from": {"id": 7}}})
+
+
+def test_single_worker():
+    assert 0 == shard_for(_message(42), 1)
+
+
+def test_well_distributed():
+    workers = 4
+    counts = Counter(shard_for_chat(chat_id, workers) for chat_id in range(100000, 104000))
+
+    assert set(range(workers)) == set(counts)
+    # Each worker within ±15% of a fair share
+    fair = 4000 / workers
+    assert all(abs(n - fair) < fair * 0.15 for n in counts.values())
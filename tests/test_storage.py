@@ -0,0 +1,102 @@
+import time
+
+import pytest
+
+from billrender_bot.storage.loader import is_shared, make_backend
+from billrender_bot.storage.memory import MemoryBackend
+from billrender_bot.storage.sqlite import SQLiteBackend
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if "memory" == request.param:
+        return MemoryBackend()
+    return SQLiteBackend(str(tmp_path / "cache.db"))
+
+
+def test_set_get_delete(backend):
+    backend.set("a", b"1")
+    assert b"1" == backend.get("a")
+
+    backend.delete("a")
+    assert backend.get("a") is None
+
+
+def test_add_only_once_until_expired(backend):
+    assert backend.add("lock", b"1", ttl=0.05)
+    assert not backend.add("lock", b"2", ttl=0.05)
+    assert b"1" == backend.get("lock")
+
+    time.sleep(0.06)
+    assert backend.get("lock") is None
+    assert backend.add("lock", b"3")
+
+
+def test_keys_escapes_like_wildcards(backend):
+    backend.set("a_1", b"x")
+    backend.set("ab1", b"x")
+    backend.set("a%1", b"x")
+    backend.set("aX%1", b"x")
+
+    assert ["a_1"] == backend.keys("a_")
+    assert ["a%1"] == backend.keys("a%")
+
+
+def test_keys_skips_expired(backend):
+    backend.set("p:1", b"x", ttl=0.05)
+    backend.set("p:2", b"x")
+    time.sleep(0.06)
+
+    assert ["p:2"] == backend.keys("p:")
+
+
+def test_sets(backend):
+    assert backend.sadd("s", "a")
+    assert not backend.sadd("s", "a")
+    assert backend.sadd("s", "b")
+    assert {"a", "b"} == backend.smembers("s")
+    assert 2 == backend.scard("s")
+
+    backend.srem("s", "a")
+    assert {"b"} == backend.smembers("s")
+    assert ["s"] == backend.keys("s")
+
+    backend.delete("s")
+    assert 0 == backend.scard("s")
+
+
+def test_set_expiry_is_refreshable(backend):
+    backend.sadd("s", "a")
+    backend.expire("s", 0.1)
+    time.sleep(0.06)
+    backend.expire("s", 0.1)
+    time.sleep(0.06)
+    assert {"a"} == backend.smembers("s")
+
+    time.sleep(0.06)
+    assert 0 == backend.scard("s")
+    assert backend.sadd("s", "a")
+
+
+def test_sqlite_is_shared_between_connections(tmp_path):
+    path = str(tmp_path / "cache.db")
+    first, second = SQLiteBackend(path), SQLiteBackend(path)
+
+    first.set("k", b"v")
+    assert first.sadd("s", "a")
+
+    assert b"v" == second.get("k")
+    assert not second.add("k", b"w")
+    assert not second.sadd("s", "a")
+
+
+def test_loader(tmp_path):
+    assert isinstance(make_backend("memory"), MemoryBackend)
+    assert isinstance(make_backend(f"sqlite:///{tmp_path}/c.db"), SQLiteBackend)
+
+    assert not is_shared("memory")
+    assert is_shared("sqlite:///cache.db")
+    assert is_shared("redis://localhost:6379/0")
+
+    with pytest.raises(RuntimeError):
+        make_backend("memcached://localhost")
@@ -0,0 +1,307 @@
+import asyncio
+import os
+import tempfile
+import time
+
+import pytest
+
+pytest.importorskip("telegram")
+
+from billrender_bot.storage.memory import MemoryBackend
+from billrender_bot.storage.sqlite import SQLiteBackend
+from billrender_bot.utils.work_queue import (
+    BUSY_TEXT,
+    DUPLICATE_TEXT,
+    FAILED_TEXT,
+    WORKING_TEXT,
+    PhotoReply,
+    TextReply,
+    WorkQueue,
+)
+
+
+class FakeChat:
+    def __init__(self, chat_id):
+        self.id = chat_id
+        self.photos = []
+
+    async def send_photo(self, photo, caption=""):
+        self.photos.append((photo, caption))
+        return FakeMessage(self, "")
+
+
+class FakeMessage:
+    def __init__(self, chat, text):
+        self.chat = chat
+        self.text = text
+        self.photo = []
+        self.deleted = False
+        self.replies = []
+
+    async def reply_text(self, text):
+        reply = FakeMessage(self.chat, text)
+        self.replies.append(reply)
+        return reply
+
+    async def edit_text(self, text, reply_markup=None):
+        self.text = text
+
+    async def delete(self):
+        self.deleted = True
+
+
+class FakeUpdate:
+    def __init__(self, chat):
+        self.effective_chat = chat
+        self.effective_message = FakeMessage(chat, "")
+
+
+class FakeApplication:
+    def __init__(self):
+        self.tasks = []
+
+    def create_task(self, coro, update=None):
+        task = asyncio.ensure_future(coro)
+        self.tasks.append(task)
+        return task
+
+
+class FakeContext:
+    def __init__(self):
+        self.application = FakeApplication()
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_result_replaces_placeholder():
+    async def scenario():
+        queue = WorkQueue()
+        context = FakeContext()
+        update = FakeUpdate(FakeChat(1))
+
+        assert await queue.submit(update, context, "summary", lambda: TextReply("done"))
+        placeholder = update.effective_message.replies[0]
+        assert WORKING_TEXT == placeholder.text
+
+        await asyncio.gather(*context.application.tasks)
+        assert "done" == placeholder.text
+        assert not queue.is_pending(1, "summary")
+
+    _run(scenario())
+
+
+def test_duplicate_is_merged():
+    async def scenario():
+        queue = WorkQueue()
+        context = FakeContext()
+        chat = FakeChat(1)
+        release = asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        def job():
+            asyncio.run_coroutine_threadsafe(release.wait(), loop).result()
+            return TextReply("done")
+
+        try:
+            assert await queue.submit(FakeUpdate(chat), context, "summary", job)
+            assert not await queue.submit(FakeUpdate(chat), context, "summary", job)
+            assert 1 == len(context.application.tasks)
+        finally:
+            release.set()
+            await asyncio.gather(*context.application.tasks)
+
+    _run(scenario())
+
+
+def test_backpressure_rejects_beyond_pending_limit():
+    async def scenario():
+        queue = WorkQueue(max_pending_per_chat=2)
+        context = FakeContext()
+        chat = FakeChat(1)
+        release = asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        def job():
+            asyncio.run_coroutine_threadsafe(release.wait(), loop).result()
+            return TextReply("done")
+
+        try:
+            assert await queue.submit(FakeUpdate(chat), context, "a", job)
+            assert await queue.submit(FakeUpdate(chat), context, "b", job)
+
+            third = FakeUpdate(chat)
+            assert not await queue.submit(third, context, "c", job)
+            assert [BUSY_TEXT] == [m.text for m in third.effective_message.replies]
+
+            # Other chats are unaffected
+            assert await queue.submit(FakeUpdate(FakeChat(2)), context, "c", lambda: TextReply("ok"))
+        finally:
+            release.set()
+            await asyncio.gather(*context.application.tasks)
+
+    _run(scenario())
+
+
+def test_failed_delivery_reports_error_and_removes_file():
+    async def scenario():
+        queue = WorkQueue()
+        context = FakeContext()
+        chat = FakeChat(1)
+
+        async def broken_send_photo(photo, caption=""):
+            raise RuntimeError("upload failed")
+
+        chat.send_photo = broken_send_photo
+
+        fd, path = tempfile.mkstemp(suffix=".png")
+        os.close(fd)
+
+        update = FakeUpdate(chat)
+        assert await queue.submit(update, context, "bill", lambda: PhotoReply(path=path))
+        with pytest.raises(RuntimeError):
+            await asyncio.gather(*context.application.tasks)
+
+        assert FAILED_TEXT == update.effective_message.replies[0].text
+        assert not os.path.exists(path)
+        assert not queue.is_pending(1, "bill")
+
+    _run(scenario())
+
+
+def test_photo_is_sent_and_file_removed():
+    async def scenario():
+        queue = WorkQueue()
+        context = FakeContext()
+        chat = FakeChat(1)
+
+        fd, path = tempfile.mkstemp(suffix=".png")
+        os.close(fd)
+
+        update = FakeUpdate(chat)
+        await queue.submit(update, context, "bill", lambda: PhotoReply(path=path, caption="bill"))
+        await asyncio.gather(*context.application.tasks)
+
+        assert 1 == len(chat.photos)
+        assert update.effective_message.replies[0].deleted
+        assert not os.path.exists(path)
+
+    _run(scenario())
+
+
+def test_failed_placeholder_cleanup_is_not_reported():
+    from telegram.error import BadRequest
+
+    async def scenario():
+        queue = WorkQueue()
+        context = FakeContext()
+        chat = FakeChat(1)
+
+        fd, path = tempfile.mkstemp(suffix=".png")
+        os.close(fd)
+
+        update = FakeUpdate(chat)
+        await queue.submit(update, context, "bill", lambda: PhotoReply(path=path))
+        placeholder = update.effective_message.replies[0]
+
+        async def broken_delete():
+            raise BadRequest("Message can't be deleted")
+
+        placeholder.delete = broken_delete
+        await asyncio.gather(*context.application.tasks)
+
+        assert 1 == len(chat.photos)
+        assert FAILED_TEXT != placeholder.text
+
+    _run(scenario())
+
+
+def test_duplicate_tap_gets_a_reply():
+    async def scenario():
+        queue = WorkQueue()
+        context = FakeContext()
+        chat = FakeChat(1)
+        release = asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        def job():
+            asyncio.run_coroutine_threadsafe(release.wait(), loop).result()
+            return TextReply("done")
+
+        try:
+            await queue.submit(FakeUpdate(chat), context, "summary", job)
+            second = FakeUpdate(chat)
+            await queue.submit(second, context, "summary", job)
+            assert [DUPLICATE_TEXT] == [m.text for m in second.effective_message.replies]
+        finally:
+            release.set()
+            await asyncio.gather(*context.application.tasks)
+
+    _run(scenario())
+
+
+def test_queues_sharing_a_backend_merge_duplicates(tmp_path):
+    path = str(tmp_path / "cache.db")
+
+    async def scenario():
+        # Two workers' queues, each with its own connection to one file
+        first = WorkQueue(backend=SQLiteBackend(path))
+        second = WorkQueue(backend=SQLiteBackend(path))
+        context = FakeContext()
+        chat = FakeChat(1)
+        release = asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        def job():
+            asyncio.run_coroutine_threadsafe(release.wait(), loop).result()
+            return TextReply("done")
+
+        try:
+            assert await first.submit(FakeUpdate(chat), context, "bill", job)
+            assert await asyncio.to_thread(second.is_pending, 1, "bill")
+
+            duplicate = FakeUpdate(chat)
+            assert not await second.submit(duplicate, context, "bill", job)
+            assert [DUPLICATE_TEXT] == [m.text for m in duplicate.effective_message.replies]
+        finally:
+            release.set()
+            await asyncio.gather(*context.application.tasks)
+
+        # Released for everyone once done
+        assert not await asyncio.to_thread(second.is_pending, 1, "bill")
+        assert await second.submit(FakeUpdate(chat), context, "bill", lambda: TextReply("again"))
+        await asyncio.gather(*context.application.tasks)
+
+    _run(scenario())
+
+
+def test_clear_pending_drops_leftovers_of_owned_chats():
+    backend = MemoryBackend()
+    # Markers left behind by a crashed worker
+    backend.sadd("pending:1", "bill")
+    backend.sadd("pending:2", "bill")
+
+    WorkQueue(backend=backend).clear_pending(lambda chat_id: 1 == chat_id)
+
+    assert 0 == backend.scard("pending:1")
+    assert 1 == backend.scard("pending:2")
+
+
+def test_pending_marker_outlives_ttl_while_job_runs():
+    async def scenario():
+        backend = MemoryBackend()
+        queue = WorkQueue(backend=backend, pending_ttl=0.06)
+        context = FakeContext()
+        chat = FakeChat(1)
+
+        def job():
+            time.sleep(0.2)
+            return TextReply("done")
+
+        await queue.submit(FakeUpdate(chat), context, "bill", job)
+        await asyncio.sleep(0.15)
+        assert await asyncio.to_thread(queue.is_pending, 1, "bill")
+        await asyncio.gather(*context.application.tasks)
+
+    _run(scenario())